@@ -13,11 +13,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import functools
 import os
 import re
 import urllib.parse
-from typing import List, Tuple, Optional, Union
-import io
+from bisect import bisect_left
+from itertools import chain, groupby, islice
+from operator import attrgetter
+from typing import Iterable, List, Tuple, Optional, Union
 import abc
 
 from rapidfuzz import fuzz
@@ -32,68 +35,199 @@ LINES_SMALL_MAX = 12
 LINES_SMALLER_MAX = 18
 LINES_SPLIT_TRIGGER = 18
 
+# Density classes for slides with more lines than each threshold (sorted ascending)
+_DENSITY_THRESHOLDS = (LINES_NORMAL_MAX, LINES_SMALL_MAX, LINES_SMALLER_MAX)
+_DENSITY_CLASSES = (None, "small", "smaller", "smallest")
+
 DEFAULT_SLIDE_WIDTH_PX = 1600
 DEFAULT_SLIDE_HEIGHT_PX = 900
 
+# Minimum fuzz.ratio for consecutive titles to count as the same title
+TITLE_SIMILARITY_CUTOFF = 92
+
 MARP_TARGET_WIDTH_PX = 1280
 MARP_TARGET_HEIGHT_PX = 720
 
+
+# Run text whitespace normalization: non-breaking space (U+00A0) and narrow no-break
+# space (U+202F) become regular spaces, vertical tab (\x0B) is removed.
+_WS_TRANSLATE = str.maketrans({'\u00A0': ' ', '\u202F': ' ', '\x0B': None})
+
+def _normalize_run_text(text: str) -> str:
+    return text.translate(_WS_TRANSLATE)
+
+
+# Runs of backticks, for sizing inline code fences
+_BACKTICK_RUN_RE = re.compile(r'`+')
+
+# HTML-like tags, escaped as a whole by the Markdown-based formatters
+HTML_TAG_RE = re.compile(r'(<[^>]+>)')
+
+
+def _strip_len(text: str) -> int:
+    """Returns len(text.strip()) without building the stripped copy."""
+    end = len(text)
+    start = 0
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return end - start
+
+
+def _runs_strip_len(runs: List[TextRun]) -> int:
+    """Returns the stripped length of the runs' concatenated text without joining it."""
+    total = sum(len(run.text) for run in runs)
+    leading = 0
+    for run in runs:
+        text_without_leading = run.text.lstrip()
+        leading += len(run.text) - len(text_without_leading)
+        if text_without_leading:
+            break
+    else: # All runs are whitespace
+        return 0
+    trailing = 0
+    for run in reversed(runs):
+        text_without_trailing = run.text.rstrip()
+        trailing += len(run.text) - len(text_without_trailing)
+        if text_without_trailing:
+            break
+    return total - leading - trailing
+
+
+# Style attributes that must match for adjacent runs to be merged, fetched as one tuple
+_run_style_key = attrgetter('style.is_code', 'style.is_accent', 'style.is_strong', 'style.is_math',
+                            'style.hyperlink', 'style.color_rgb')
+
+
+# Per-element handlers for Formatter._get_slide_content_metrics. Each returns
+# (lines, chars, content_for_avg), where content_for_avg is the text (or runs) whose
+# stripped length feeds the average line length heuristic, or None for elements that
+# do not take part in it. The stripped length is only measured when it is needed.
+def _title_metrics(element: SlideElement) -> Tuple[int, int, Optional[str]]:
+    content = element.content.strip() if isinstance(element.content, str) else ""
+    return 1, len(content), None
+
+
+def _text_metrics(element: SlideElement) -> Tuple[int, int, Union[str, List[TextRun]]]:
+    # ListItem and Paragraph
+    if isinstance(element.content, list): # List[TextRun]
+        return 1, sum(len(run.text) for run in element.content), element.content
+    if isinstance(element.content, str):
+        return 1, len(element.content), element.content
+    return 1, 0, ""
+
+
+def _code_block_metrics(element: SlideElement) -> Tuple[int, int, Optional[str]]:
+    lines = (element.content.count('\n') + 1) if element.content else 1
+    return lines, len(element.content), None
+
+
+def _table_metrics(element: SlideElement) -> Tuple[int, int, Optional[str]]:
+    if not element.content:
+        return 0, 0, None
+    # Cells are List[TextRun], with plain strings as a fallback
+    chars = sum(
+        sum(len(run.text) for run in cell) if isinstance(cell, list) else len(cell) if isinstance(cell, str) else 0
+        for row in element.content for cell in row)
+    return len(element.content), chars, None
+
+
+_METRIC_HANDLERS = {
+    ElementType.Title: _title_metrics,
+    ElementType.ListItem: _text_metrics,
+    ElementType.Paragraph: _text_metrics,
+    ElementType.CodeBlock: _code_block_metrics,
+    ElementType.Table: _table_metrics,
+}
+
+
+def titles_are_similar(previous: str, current: str, cutoff: int = TITLE_SIMILARITY_CUTOFF) -> bool:
+    """Whether two titles reach the fuzz.ratio cutoff. The ratio is at most
+       200 * min(len) / (len_a + len_b), so titles of very different lengths are
+       rejected without running the scorer."""
+    len_a, len_b = len(previous), len(current)
+    if 200 * min(len_a, len_b) < cutoff * (len_a + len_b):
+        return False
+    return fuzz.ratio(previous, current, score_cutoff=cutoff) > 0
+
+
+def format_table_cell(cell: str) -> str:
+    """Makes a formatted cell fit on one Markdown table row. Newlines become <br />,
+       except in cells holding inline code, where HTML would be shown literally."""
+    return cell.replace('\n', ' ') if '`' in cell else cell.replace('\n', '<br />')
+
+
+@functools.lru_cache(maxsize=512)
+def image_url(path: str) -> str:
+    """Image path as a Markdown link target: forward slashes, then URL-quoted.
+       Cached, since decks often reuse the same image (logos, icons) on many slides."""
+    return urllib.parse.quote(path.replace('\\', '/'))
+
+
 class Formatter(abc.ABC):
+    # Opening and closing markup used by get_strong and get_accent
+    strong_delimiters: Tuple[str, str] = ('__', '__')
+    accent_delimiters: Tuple[str, str] = ('_', '_')
 
     def __init__(self, config: ConversionConfig):
         os.makedirs(config.output_path.parent, exist_ok=True)
         self.ofile = open(config.output_path, 'w', encoding='utf8')
         self.config = config
-        # For BeamerFormatter and potentially others that buffer output
-        self._buffer = io.StringIO()
+        # Checked on every escape; the flag is fixed for the formatter's lifetime
+        self._disable_escaping = config.disable_escaping
+        # Output fragments, written to self.ofile in close()
+        self._buffer: List[str] = []
+        if type(self).write is Formatter.write:
+            # Bind write straight to list.append, skipping a Python call per fragment.
+            # Only done when write() is not overridden; streaming formatters (e.g. Beamer)
+            # rebind self.write = self.ofile.write after calling super().__init__().
+            self.write = self._buffer.append
         self.last_title_info: Optional[Tuple[str, int]] = None # Common for title similarity logic
+        # Per-element-type writers, called with (element, formatted text, previous element type).
+        # Bound here so that overrides of the _put_*_element methods in subclasses are picked up.
+        self._element_writers = {
+            ElementType.Title: self._put_title_element,
+            ElementType.ListItem: self._put_list_item_element,
+            ElementType.Paragraph: self._put_paragraph_element,
+            ElementType.Image: self._put_image_element,
+            ElementType.Table: self._put_table_element,
+            ElementType.CodeBlock: self._put_code_block_element,
+            ElementType.Formula: self._put_formula_element,
+        }
+        # Strong and accent together wrap the text once in the combined delimiters, accent
+        # outermost. Only valid while both come from the delimiter attributes.
+        self._strong_accent_delimiters: Optional[Tuple[str, str]] = None
+        if type(self).get_strong is Formatter.get_strong and type(self).get_accent is Formatter.get_accent:
+            self._strong_accent_delimiters = (self.accent_delimiters[0] + self.strong_delimiters[0],
+                                              self.strong_delimiters[1] + self.accent_delimiters[1])
 
     def write(self, text: str):
         # Default write to buffer. Formatters writing directly to file can override.
-        self._buffer.write(text)
+        self._buffer.append(text)
 
     def _format_text_with_delimiters(self, text: str, open_delimiter: str, close_delimiter: str) -> str:
         if not text: # Handle empty string input early
             return text # Return original empty string
+        if not text[0].isspace() and not text[-1].isspace(): # Common case: nothing to isolate
+            return f"{open_delimiter}{text}{close_delimiter}"
 
-        # 1. Find leading whitespace
-        leading_whitespace_count = 0
-        for char_idx, char_val in enumerate(text):
-            if not char_val.isspace():
-                leading_whitespace_count = char_idx
-                break
-        else: # String is all whitespace
+        # Isolate leading/trailing whitespace so delimiters wrap only the core text
+        text_without_leading = text.lstrip()
+        if not text_without_leading: # String is all whitespace
             return text
-        leading_whitespace = text[:leading_whitespace_count]
-        text_without_leading = text[leading_whitespace_count:]
-
-        # Handle case where original text was only leading whitespace correctly
-        if not text_without_leading: 
-            return text 
-
-        # 2. Find trailing whitespace (from text_without_leading)
-        trailing_whitespace_count = 0
-        for char_idx, char_val in enumerate(reversed(text_without_leading)):
-            if not char_val.isspace():
-                trailing_whitespace_count = char_idx
-                break
-        # No 'else' needed here. If text_without_leading is all whitespace, 
-        # trailing_whitespace_count will remain 0, and core_text will become empty.
-        
-        core_text_end_index = len(text_without_leading) - trailing_whitespace_count
-        core_text = text_without_leading[:core_text_end_index]
-        trailing_whitespace = text_without_leading[core_text_end_index:]
-
-        if not core_text: # If, after stripping both ends, core is empty
-                          # This implies the original text (after leading strip) was all whitespace,
-                          # or the original text itself was effectively empty of non-whitespace.
-            return text # Return original text to avoid "open_delimiterclose_delimiter" for "   "
-        
+        leading_whitespace = text[:len(text) - len(text_without_leading)]
+
+        core_text = text_without_leading.rstrip()
+        trailing_whitespace = text_without_leading[len(core_text):]
+
         return f"{leading_whitespace}{open_delimiter}{core_text}{close_delimiter}{trailing_whitespace}"
 
-    def _get_slide_content_metrics(self, elements_list: List[SlideElement]) -> Tuple[int, int, Optional[int], Optional[int], int, int]:
+    def _get_slide_content_metrics(self, elements_list: List[SlideElement], collect_avg: bool = True) -> Tuple[int, int, Optional[int], Optional[int], int, int, bool]:
         """Calculates number of semantic lines, total characters, max image dimensions,
-           and specific text line/char counts for avg line length heuristic."""
+           specific text line/char counts for avg line length heuristic, and whether
+           any of the elements is a table. The avg line length counts are left at 0
+           unless collect_avg is set."""
         line_count = 0
         char_count = 0
         max_image_width: Optional[int] = 0
@@ -101,84 +235,92 @@ class Formatter(abc.ABC):
         
         text_lines_for_avg_heuristic = 0
         text_chars_for_avg_heuristic = 0
+        has_table = False
 
         for element in elements_list:
-            element_text_content_for_avg = ""
-            is_text_for_avg_heuristic = False
-
-            if element.type == ElementType.Title:
-                line_count += 1
-                content = element.content.strip() if isinstance(element.content, str) else ""
-                char_count += len(content)
-            elif element.type == ElementType.ListItem:
-                line_count += 1
-                text_lines_for_avg_heuristic += 1
-                is_text_for_avg_heuristic = True
-                if isinstance(element.content, list): # List[TextRun]
-                    item_text = "".join(run.text for run in element.content)
-                    char_count += len(item_text)
-                    element_text_content_for_avg = item_text
-                elif isinstance(element.content, str): 
-                    char_count += len(element.content)
-                    element_text_content_for_avg = element.content
-
-            elif element.type == ElementType.Paragraph:
-                line_count += 1 
-                text_lines_for_avg_heuristic += 1
-                is_text_for_avg_heuristic = True
-                if isinstance(element.content, list): # List[TextRun]
-                    para_text = "".join(run.text for run in element.content)
-                    char_count += len(para_text)
-                    element_text_content_for_avg = para_text
-                elif isinstance(element.content, str): 
-                     char_count += len(element.content)
-                     element_text_content_for_avg = element.content
-            
-            elif element.type == ElementType.CodeBlock:
-                line_count += (element.content.count('\n') + 1) if element.content else 1
-                char_count += len(element.content)
-            
-            elif element.type == ElementType.Table:
-                if element.content: 
-                    line_count += len(element.content) 
-                    for row in element.content:
-                        for cell_runs in row: # Assuming cell is List[TextRun]
-                            if isinstance(cell_runs, list):
-                                for run in cell_runs:
-                                    char_count += len(run.text)
-                            elif isinstance(cell_runs, str): # Fallback if cell is string
-                                char_count += len(cell_runs)
-            
+            handler = _METRIC_HANDLERS.get(element.type)
+            if handler is not None:
+                if element.type == ElementType.Table:
+                    has_table = True
+                element_lines, element_chars, element_text_content_for_avg = handler(element)
+                line_count += element_lines
+                char_count += element_chars
+                if collect_avg and element_text_content_for_avg is not None:
+                    text_lines_for_avg_heuristic += 1
+                    text_chars_for_avg_heuristic += (
+                        _strip_len(element_text_content_for_avg) if isinstance(element_text_content_for_avg, str)
+                        else _runs_strip_len(element_text_content_for_avg))
             elif element.type == ElementType.Image:
                 if hasattr(element, 'display_width_px') and element.display_width_px is not None:
                     max_image_width = max(max_image_width or 0, element.display_width_px)
                 if hasattr(element, 'display_height_px') and element.display_height_px is not None:
                     max_image_height = max(max_image_height or 0, element.display_height_px)
 
-            if is_text_for_avg_heuristic:
-                text_chars_for_avg_heuristic += len(element_text_content_for_avg.strip())
-
-        return line_count, char_count, max_image_width, max_image_height, text_lines_for_avg_heuristic, text_chars_for_avg_heuristic
+        return line_count, char_count, max_image_width, max_image_height, text_lines_for_avg_heuristic, text_chars_for_avg_heuristic, has_table
 
     def _get_slide_density_class(self, line_count: int) -> Optional[str]:
         """Determines a density class based on line count."""
-        if line_count > LINES_SMALLER_MAX: return "smallest"
-        if line_count > LINES_SMALL_MAX: return "smaller"
-        if line_count > LINES_NORMAL_MAX: return "small"
-        return None
+        # bisect_left counts the thresholds strictly below line_count
+        return _DENSITY_CLASSES[bisect_left(_DENSITY_THRESHOLDS, line_count)]
+
+    def _put_title_element(self, element: SlideElement, text: str, last_element_type: Optional[ElementType]):
+        title_text = element.content.strip() if isinstance(element.content, str) else text.strip()
+        if not title_text:
+            return
+        is_similar_to_last = False
+        if self.last_title_info and self.last_title_info[1] == element.level and \
+           titles_are_similar(self.last_title_info[0], title_text):
+            is_similar_to_last = True
+
+        if is_similar_to_last:
+            if self.config.keep_similar_titles:
+                effective_title = f'{title_text} (cont.)'
+                self.put_title(effective_title, element.level)
+                self.last_title_info = (effective_title, element.level)
+            # else skip
+        else:
+            self.put_title(title_text, element.level)
+            self.last_title_info = (title_text, element.level)
+
+    def _put_list_item_element(self, element: SlideElement, text: str, last_element_type: Optional[ElementType]):
+        if not (last_element_type and last_element_type == ElementType.ListItem):
+            self.put_list_header()
+        self.put_list(text, element.level)
+
+    def _put_paragraph_element(self, element: SlideElement, text: str, last_element_type: Optional[ElementType]):
+        self.put_para(text)
+
+    def _put_image_element(self, element: SlideElement, text: str, last_element_type: Optional[ElementType]):
+        # Pass the whole element for rich data; specific formatters override put_image.
+        self.put_image(element)
+
+    def _put_table_element(self, element: SlideElement, text: str, last_element_type: Optional[ElementType]):
+        # Pass processed cell content. Rows are mapped one by one rather than flattened and
+        # reshaped, since rows are not guaranteed to have the same number of cells.
+        format_cell = lambda cell: self.get_formatted_runs(cell) if isinstance(cell, list) else str(cell)
+        self.put_table([list(map(format_cell, row)) for row in element.content])
+
+    def _put_code_block_element(self, element: SlideElement, text: str, last_element_type: Optional[ElementType]):
+        self.put_code_block(element.content, element.language)
+
+    def _put_formula_element(self, element: SlideElement, text: str, last_element_type: Optional[ElementType]):
+        if isinstance(element, FormulaElement):
+            self.put_formula(element)
 
     def output(self, presentation_data: ParsedPresentation):
         self.put_header()
 
         last_element_type: Optional[ElementType] = None # Changed from last_element to track type
         # self.last_title_info is already in __init__
+        element_writers = self._element_writers
 
         for slide_idx, slide in enumerate(presentation_data.slides):
-            all_elements: List[SlideElement] = []
+            all_elements: Iterable[SlideElement] = ()
             if slide.type == SlideType.General:
                 all_elements = slide.elements
             elif slide.type == SlideType.MultiColumn:
-                all_elements = slide.preface + [el for col in slide.columns for el in col]
+                # Iterate preface and columns lazily instead of building a flattened copy
+                all_elements = chain(slide.preface, *slide.columns)
 
 
             for element in all_elements:
@@ -196,50 +338,9 @@ class Formatter(abc.ABC):
                         current_content_str = element.content 
                     # else: content might be of unexpected type for these elements
 
-                match element.type:
-                    case ElementType.Title:
-                        title_text = element.content.strip() if isinstance(element.content, str) else current_content_str.strip()
-                        if title_text:
-                            is_similar_to_last = False
-                            if self.last_title_info and self.last_title_info[1] == element.level and \
-                               fuzz.ratio(self.last_title_info[0], title_text, score_cutoff=92):
-                                is_similar_to_last = True
-                            
-                            if is_similar_to_last:
-                                if self.config.keep_similar_titles:
-                                    effective_title = f'{title_text} (cont.)'
-                                    self.put_title(effective_title, element.level)
-                                    self.last_title_info = (effective_title, element.level)
-                                # else skip
-                            else:
-                                self.put_title(title_text, element.level)
-                                self.last_title_info = (title_text, element.level)
-                    case ElementType.ListItem:
-                        if not (last_element_type and last_element_type == ElementType.ListItem):
-                            self.put_list_header()
-                        self.put_list(current_content_str, element.level)
-                    case ElementType.Paragraph:
-                        self.put_para(current_content_str)
-                    case ElementType.Image:
-                        # Base Formatter might not know how to put_image.
-                        # This will be overridden by specific formatters.
-                        # Pass the whole element for rich data.
-                        if hasattr(self, 'put_image') and callable(self.put_image):
-                            self.put_image(element) 
-                    case ElementType.Table:
-                        # Similar to image, specific formatters will implement.
-                        # Pass processed cell content.
-                        if hasattr(self, 'put_table') and callable(self.put_table):
-                            table_content = [[self.get_formatted_runs(cell) if isinstance(cell, list) else str(cell) for cell in row] for row in element.content]
-                            self.put_table(table_content)
-                    case ElementType.CodeBlock:
-                        # Base Formatter might not know how to put_code_block.
-                        if hasattr(self, 'put_code_block') and callable(self.put_code_block):
-                            self.put_code_block(element.content, element.language)
-                    case ElementType.Formula:
-                        if isinstance(element, FormulaElement):
-                            if hasattr(self, 'put_formula') and callable(self.put_formula):
-                                self.put_formula(element)
+                writer = element_writers.get(element.type)
+                if writer is not None:
+                    writer(element, current_content_str, last_element_type)
                 last_element_type = element.type
 
             if last_element_type == ElementType.ListItem:
@@ -275,17 +376,12 @@ class Formatter(abc.ABC):
         # self.put_para('') # Example if spacing is needed.
         pass
 
-    def _styles_are_compatible(self, style1: Optional[TextStyle], style2: Optional[TextStyle]) -> bool:
-        if style1 is None or style2 is None:
-            return False # Should not happen with proper initialization
-        return (style1.is_code == style2.is_code and
-                style1.is_accent == style2.is_accent and
-                style1.is_strong == style2.is_strong and
-                style1.is_math == style2.is_math and 
-                style1.hyperlink == style2.hyperlink and
-                style1.color_rgb == style2.color_rgb)
-
     def _format_single_merged_run(self, text: str, style: TextStyle) -> str:
+        if style.is_plain: # Common case: escaping only
+            if not text or self._disable_escaping:
+                return text
+            return self.get_escaped(text)
+
         if not text and not style.is_code and not style.is_math: # Allow empty code/math runs potentially
             return ""
 
@@ -302,16 +398,19 @@ class Formatter(abc.ABC):
             return self.get_inline_math(formatted_text)
 
         # Process non-code, non-math text
-        if not self.config.disable_escaping:
+        if not self._disable_escaping:
             formatted_text = self.get_escaped(formatted_text)
         
         # Apply strong and accent (bold and italic)
         # This order will result in accent (e.g., italics) being the inner markup
         # if both are applied, e.g., **_text_** or __*text*__
-        if style.is_strong:
-            formatted_text = self.get_strong(formatted_text)
-        if style.is_accent:
-            formatted_text = self.get_accent(formatted_text)
+        if style.is_strong and style.is_accent and self._strong_accent_delimiters:
+            formatted_text = self._format_text_with_delimiters(formatted_text, *self._strong_accent_delimiters)
+        else:
+            if style.is_strong:
+                formatted_text = self.get_strong(formatted_text)
+            if style.is_accent:
+                formatted_text = self.get_accent(formatted_text)
         
         if style.color_rgb and not self.config.disable_color:
             formatted_text = self.get_colored(formatted_text, style.color_rgb)
@@ -327,44 +426,30 @@ class Formatter(abc.ABC):
 
         output_segments: List[str] = []
         
-        def _normalize_whitespace_in_run_text(text: str) -> str:
-            # Replace non-breaking space (U+00A0) with a regular space (U+0020).
-            normalized_text = text.replace('\u00A0', ' ')
-            # Narrow No-Break Space
-            normalized_text = normalized_text.replace('\u202F', ' ')
-            # Remove vertical tab (\x0B) for all non-code, non-math text
-            normalized_text = normalized_text.replace('\x0B', '')
-            return normalized_text
-
-        # Initialize with the first run
-        current_merged_text = _normalize_whitespace_in_run_text(runs[0].text)
-        current_style = runs[0].style
-
-        for i in range(1, len(runs)):
-            next_run = runs[i]
-            normalized_next_text = _normalize_whitespace_in_run_text(next_run.text)
-
-            if self._styles_are_compatible(current_style, next_run.style):
-                # Styles are compatible, merge text
-                current_merged_text += normalized_next_text
-            else:
-                # Styles differ, format the accumulated text and add to segments
-                # Process if text exists or if it's an intentionally empty code/math run
-                if current_merged_text or (current_style and (current_style.is_code or current_style.is_math)):
-                    # Only sanitize vertical tab for non-code, non-math
-                    if not (current_style and (current_style.is_code or current_style.is_math)):
-                        current_merged_text = current_merged_text.replace('\x0B', '')
-                    output_segments.append(self._format_single_merged_run(current_merged_text, current_style))
-                # Start a new merged run
-                current_merged_text = normalized_next_text
-                current_style = next_run.style
-        # Format the last accumulated run
-        if current_merged_text or (current_style and (current_style.is_code or current_style.is_math)):
-            if not (current_style and (current_style.is_code or current_style.is_math)):
-                current_merged_text = current_merged_text.replace('\x0B', '')
-            output_segments.append(self._format_single_merged_run(current_merged_text, current_style))
+        # Fast path for the common single unstyled run: nothing to merge or wrap
+        if len(runs) == 1:
+            if runs[0].style.is_plain:
+                text = _normalize_run_text(runs[0].text)
+                if not self._disable_escaping:
+                    text = self.get_escaped(text)
+                if text and (text[0].isspace() or text[-1].isspace()):
+                    text = text.strip()
+                return text
+
+        # Merge consecutive runs with identical styles and format each merged segment
+        for _, style_group in groupby(runs, key=_run_style_key):
+            group_runs = list(style_group)
+            current_style = group_runs[0].style
+            current_merged_text = "".join([_normalize_run_text(run.text) for run in group_runs])
+            # Process if text exists or if it's an intentionally empty code/math run
+            # Vertical tabs were already removed by _normalize_run_text.
+            if current_merged_text or (current_style and (current_style.is_code or current_style.is_math)):
+                output_segments.append(self._format_single_merged_run(current_merged_text, current_style))
         final_text = "".join(output_segments)
-        return final_text.strip()
+        # Only strip (and allocate a new string) when there is edge whitespace to remove
+        if final_text and (final_text[0].isspace() or final_text[-1].isspace()):
+            final_text = final_text.strip()
+        return final_text
 
     def put_para(self, text):
         pass
@@ -372,18 +457,19 @@ class Formatter(abc.ABC):
     def put_image(self, path, max_width): # Base signature, specific formatters might take ImageElement
         pass
 
-    def put_table(self, table: List[List[str]]): # table cells are already formatted strings
-        if not table or not table[0]:
+    def put_table(self, table: Iterable[Iterable[str]]): # table cells are already formatted strings
+        # Rows may be lazy iterables, so the body is formatted while it is joined
+        rows = iter(table)
+        header = [format_table_cell(c) for c in next(rows, ())]
+        if not header:
             return # Handle empty table
-        
-        gen_table_row = lambda row: '| ' + ' | '.join([
-            c.replace('\n', '<br />') if '`' not in c else c.replace('\n', ' ') 
-            for c in row
-        ]) + ' |'
-        
-        self.write(gen_table_row(table[0]) + '\n') 
-        self.write(gen_table_row([':-' for _ in table[0]]) + '\n') 
-        self.write('\n'.join([gen_table_row(row) for row in table[1:]]) + '\n\n')
+
+        gen_table_row = lambda row: '| ' + ' | '.join([format_table_cell(c) for c in row]) + ' |'
+        separator_row = '| ' + ' | '.join([':-'] * len(header)) + ' |'
+
+        # Header, separator and body rows emitted in a single write
+        self.write('| ' + ' | '.join(header) + f" |\n{separator_row}\n" +
+                   '\n'.join([gen_table_row(row) for row in rows]) + '\n\n')
 
     def put_code_block(self, code: str, language: Optional[str]):
         lang_tag = language if language else ""
@@ -401,15 +487,7 @@ class Formatter(abc.ABC):
             return ""
 
         # Find the longest sequence of backticks in the text
-        longest_backtick_sequence = 0
-        current_backtick_sequence = 0
-        for char in text:
-            if char == '`':
-                current_backtick_sequence += 1
-            else:
-                longest_backtick_sequence = max(longest_backtick_sequence, current_backtick_sequence)
-                current_backtick_sequence = 0
-        longest_backtick_sequence = max(longest_backtick_sequence, current_backtick_sequence)
+        longest_backtick_sequence = max(map(len, _BACKTICK_RUN_RE.findall(text)), default=0)
 
         # The fence should be one longer than the longest sequence found
         fence_len = longest_backtick_sequence + 1
@@ -425,17 +503,19 @@ class Formatter(abc.ABC):
         # If `text` is 'a`b', `fence_len` will be 2, result "``a`b``".
         
         # A common strategy for CommonMark compliance with content starting/ending with backticks
-        # or being all backticks, when the fence is a single backtick:
-        if fence_len == 1 and (text.startswith('`') or text.endswith('`') or text.isspace()):
+        # or being all backticks, when the fence is a single backtick. A single-backtick fence
+        # means the text holds no backticks, so only all-whitespace text needs padding; the
+        # first character rules that out before isspace() scans the whole string.
+        if fence_len == 1 and text[0].isspace() and text.isspace():
              return f"{fence} {text} {fence}"
         
         return f"{fence}{text}{fence}"
 
     def get_accent(self, text):
-        return self._format_text_with_delimiters(text, '_', '_')
+        return self._format_text_with_delimiters(text, *self.accent_delimiters)
 
     def get_strong(self, text):
-        return self._format_text_with_delimiters(text, '__', '__')
+        return self._format_text_with_delimiters(text, *self.strong_delimiters)
 
     def get_inline_math(self, text: str) -> str:
         if not text:
@@ -452,9 +532,7 @@ class Formatter(abc.ABC):
         overall_lw = text[:overall_lw_len]
 
         core_run_text = text_lstripped.rstrip() # This is the central content of the run
-        
-        overall_tw_len = len(text_lstripped) - len(core_run_text)
-        overall_tw = text_lstripped[len(core_run_text):] if overall_tw_len > 0 else ""
+        overall_tw = text_lstripped[len(core_run_text):]
 
         # 2. Identify Formula Candidate Payload from core_run_text
         formula_candidate_payload: str
@@ -503,19 +581,15 @@ class Formatter(abc.ABC):
 
 
     def close(self):
-        # Default implementation: write buffer to file, then close file.
-        # Formatters directly writing to self.ofile should override self.write()
-        # or ensure they don't use self._buffer.
-        # BeamerFormatter example correctly uses self._buffer and writes it here.
-        
-        # If _buffer was used (e.g. by BeamerFormatter's self.write())
-        buffered_content = self._buffer.getvalue()
-        if buffered_content:
-            # Perform any final sanitization on buffered_content if needed
-            # Example: sanitized_output = buffered_content.replace('\x0B', ' ')
-            # For now, assume content is fine or handled by specific formatter before writing to buffer
-            self.ofile.write(buffered_content)
-        
+        # Buffered formatters append fragments to self._buffer through the bound write;
+        # they are flushed here. Streaming formatters (e.g. Beamer) rebind write to
+        # self.ofile.write, leaving the buffer empty.
+        # Fragments are handed to the file as-is; joining them first would hold a second
+        # full copy of the document in memory. The file's own buffer batches the writes.
+        if self._buffer:
+            self.ofile.writelines(self._buffer)
+            self._buffer.clear()
+
         if self.ofile:
             self.ofile.close()
             self.ofile = None # type: ignore
@@ -524,15 +598,19 @@ class Formatter(abc.ABC):
         self, 
         element: ImageElement, 
         original_slide_width_px: float,
-        target_slide_width_px: float
+        target_slide_width_px: float,
+        width_scale_factor: Optional[float] = None
     ) -> Optional[int]:
+        """width_scale_factor, if given, must be target_slide_width_px / original_slide_width_px;
+           callers hinting many images precompute it once per slide."""
         ppt_display_width = element.display_width_px
 
         if ppt_display_width is None and self.config.image_width is not None: # Default width from config
             ppt_display_width = self.config.image_width
         
         if ppt_display_width is not None and original_slide_width_px > 0:
-            width_scale_factor = target_slide_width_px / original_slide_width_px
+            if width_scale_factor is None:
+                width_scale_factor = target_slide_width_px / original_slide_width_px
             return int(round(ppt_display_width * width_scale_factor))
         
         return None
@@ -541,22 +619,28 @@ class Formatter(abc.ABC):
         self, 
         element: ImageElement, 
         original_slide_width_px: float,
-        target_slide_width_px: float
+        target_slide_width_px: float,
+        width_scale_factor: Optional[float] = None
     ) -> Optional[str]:
+        # Prioritize explicit hint if available and valid; no geometry needed then
+        explicit_hint = getattr(element, 'position_hint', None)
+        if explicit_hint in ("left", "right", "center"):
+            return explicit_hint
+
+        if element.left_px is None or original_slide_width_px <= 0:
+            return None
+
+        if width_scale_factor is None:
+            width_scale_factor = target_slide_width_px / original_slide_width_px
         scaled_display_width = self._get_scaled_image_width_for_hinting(
-            element, original_slide_width_px, target_slide_width_px
+            element, original_slide_width_px, target_slide_width_px, width_scale_factor
         )
         
         calculated_hint = None
         
-        if element.left_px is not None and original_slide_width_px > 0 and \
-           scaled_display_width is not None and scaled_display_width > 0:
-            
+        if scaled_display_width is not None and scaled_display_width > 0:
             # Scale left_px to the target coordinate system
-            if original_slide_width_px > 0 :
-                 scaled_left_px = int(round(element.left_px * (target_slide_width_px / original_slide_width_px)))
-            else: # Should not happen, but as a fallback
-                 scaled_left_px = element.left_px
+            scaled_left_px = int(round(element.left_px * width_scale_factor))
 
 
             image_center_x = scaled_left_px + (scaled_display_width / 2)
@@ -578,11 +662,6 @@ class Formatter(abc.ABC):
             elif image_center_x > right_third_boundary: 
                 calculated_hint = "right"
         
-        # Prioritize explicit hint if available and valid
-        explicit_hint = getattr(element, 'position_hint', None)
-        if explicit_hint in ["left", "right", "center"]:
-            return explicit_hint
-        
         return calculated_hint
 
     def _separate_slide_elements(
@@ -595,17 +674,22 @@ class Formatter(abc.ABC):
         floated_image_elements: List[ImageElement] = []
         other_content_elements: List[SlideElement] = []
         
-        temp_content_pool = list(initial_elements) # Work on a copy
+        # Skip a leading title by offset rather than copying the list and popping it
+        title_offset = 0
+        if initial_elements and initial_elements[0].type is ElementType.Title:
+            main_title_element = initial_elements[0]
+            title_offset = 1
 
-        if temp_content_pool and temp_content_pool[0].type == ElementType.Title:
-            main_title_element = temp_content_pool.pop(0)
+        # Shared by every image on the slide
+        width_scale_factor = target_slide_width_px / original_slide_width_px if original_slide_width_px > 0 else None
 
-        for element in temp_content_pool:
+        for element in islice(initial_elements, title_offset, None):
             if isinstance(element, ImageElement):
                 hint = self._get_image_effective_position_hint(
                     element, 
                     original_slide_width_px,
-                    target_slide_width_px
+                    target_slide_width_px,
+                    width_scale_factor
                 )
                 if hint in ["left", "right"]:
                     floated_image_elements.append(element)
@@ -13,20 +13,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import re
 from typing import List, Optional # For type hinting
 
-from pptx2md.outputter.base import Formatter
+from pptx2md.outputter.base import Formatter, HTML_TAG_RE
 from pptx2md.utils import rgb_to_hex
 from pptx2md.types import ImageElement
 
+# Backslash escapes for single Markdown special characters (',' included, as in
+# MarkdownFormatter), applied with str.translate. Vertical tab and form feed become spaces.
+_ESC_TABLE = str.maketrans({**{c: '\\' + c for c in '\\*`!_{}[]()#+,-.|'}, '\u000B': ' ', '\u000C': ' '})
+
 class MadokoFormatter(Formatter):
     # write outputs to madoko markdown
+    esc_re2 = HTML_TAG_RE # Compiled once, shared by all instances
+
     def __init__(self, config):
         super().__init__(config)
         self.write('[TOC]\n\n') # Use self.write for TOC
-        self.esc_re1 = re.compile(r'([\\\*`!_\{\}\[\]\(\)\#\+-\.\|])') # Added | for tables
-        self.esc_re2 = re.compile(r'(<[^>]+>)')
 
     def put_title(self, text, level):
         self.write('#' * level + ' ' + text + '\n\n')
@@ -78,14 +81,9 @@ class MadokoFormatter(Formatter):
 
     # get_hyperlink inherited (Markdown [text](url))
 
-    def esc_repl(self, match):
-        return '\\' + match.group(0)
-
     def get_escaped(self, text):
-        if self.config.disable_escaping:
+        if self._disable_escaping:
             return text
-        # Replace problematic Unicode characters first
-        text = text.replace('\u000B', ' ').replace('\u000C', ' ')
-        text = re.sub(self.esc_re1, self.esc_repl, text)
-        text = re.sub(self.esc_re2, self.esc_repl, text)
-        return text 
\ No newline at end of file
+        # Single characters in one translate pass, then HTML-like tags
+        text = text.translate(_ESC_TABLE)
+        return self.esc_re2.sub(r'\\\1', text) 
\ No newline at end of file
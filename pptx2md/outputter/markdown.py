@@ -13,21 +13,21 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import re
-import urllib.parse
+from itertools import islice
 from typing import List, Optional # For type hinting
 
-from pptx2md.outputter.base import Formatter
+from pptx2md.outputter.base import Formatter, format_table_cell, image_url, HTML_TAG_RE
 from pptx2md.utils import rgb_to_hex # For get_colored
 from pptx2md.types import ImageElement
 #ConversionConfig, ElementType, ParsedPresentation, SlideElement, SlideType, TextRun, ImageElement, FormulaElement, TextStyle
 
+# Backslash escapes for single Markdown special characters, applied with str.translate.
+# ',' is included as it falls in the '\+-\.' range of the other formatters' escape regex.
+_ESC_TABLE = str.maketrans({c: '\\' + c for c in '\\*`!_{}[]()#+,-.|'})
+
 class MarkdownFormatter(Formatter):
     # write outputs to markdown
-    def __init__(self, config):
-        super().__init__(config)
-        self.esc_re1 = re.compile(r'([\\\*`!_\{\}\[\]\(\)\#\+-\.\|])') # Added | to esc_re1 for tables
-        self.esc_re2 = re.compile(r'(<[^>]+>)')
+    esc_re2 = HTML_TAG_RE # Compiled once, shared by all instances
 
     def put_title(self, text, level):
         self.write('#' * level + ' ' + text + '\n\n')
@@ -39,9 +39,7 @@ class MarkdownFormatter(Formatter):
         self.write(text + '\n\n')
 
     def put_image(self, element: ImageElement):
-        # Convert to forward slashes for URLs
-        path_with_forward_slashes = str(element.path).replace('\\', '/')
-        quoted_path = urllib.parse.quote(path_with_forward_slashes)
+        quoted_path = image_url(element.path)
         
         # Use alt_text if available, otherwise use a default
         alt_text = element.alt_text if element.alt_text else "Image"
@@ -53,13 +51,13 @@ class MarkdownFormatter(Formatter):
 
     def put_table(self, table: List[List[str]]):
         if not table or not table[0]: return
-        gen_table_row = lambda row: '| ' + ' | '.join([
-            c.replace('\n', '<br />') if '`' not in c else c.replace('\n', ' ')
-            for c in row
-        ]) + ' |'
-        self.write(gen_table_row(table[0]) + '\n')
-        self.write(gen_table_row([':-:' for _ in table[0]]) + '\n') # Centered for Markdown
-        self.write('\n'.join([gen_table_row(row) for row in table[1:]]) + '\n\n')
+        gen_table_row = lambda row: '| ' + ' | '.join(map(format_table_cell, row)) + ' |'
+        separator_row = '| ' + ' | '.join([':-:'] * len(table[0])) + ' |' # Centered for Markdown
+
+        # Header, separator and body rows emitted in a single write; body rows are
+        # formatted as they are joined, without intermediate lists or a copy of the table
+        self.write(gen_table_row(table[0]) + '\n' + separator_row + '\n' +
+                   '\n'.join(map(gen_table_row, islice(table, 1, None))) + '\n\n')
 
     def put_code_block(self, code: str, language: Optional[str]):
         lang_tag = language if language else ""
@@ -73,12 +71,8 @@ class MarkdownFormatter(Formatter):
 
     # get_hyperlink inherited from base is fine: [text](url)
 
-    def esc_repl(self, match):
-        return '\\' + match.group(0)
-
     def get_escaped(self, text):
-        if self.config.disable_escaping:
+        if self._disable_escaping:
             return text
-        text = re.sub(self.esc_re1, self.esc_repl, text)
-        text = re.sub(self.esc_re2, self.esc_repl, text)
-        return text 
\ No newline at end of file
+        text = text.translate(_ESC_TABLE)
+        return self.esc_re2.sub(r'\\\1', text) 
\ No newline at end of file
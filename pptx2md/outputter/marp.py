@@ -12,22 +12,32 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import re
-import urllib.parse
+from itertools import chain
 from typing import List, Optional, Union
 
-from rapidfuzz import fuzz
-
-from pptx2md.outputter.base import Formatter, DEFAULT_SLIDE_WIDTH_PX, DEFAULT_SLIDE_HEIGHT_PX, MARP_TARGET_WIDTH_PX, MARP_TARGET_HEIGHT_PX
+from pptx2md.outputter.base import Formatter, titles_are_similar, image_url, HTML_TAG_RE, DEFAULT_SLIDE_WIDTH_PX, DEFAULT_SLIDE_HEIGHT_PX, MARP_TARGET_WIDTH_PX, MARP_TARGET_HEIGHT_PX
 from pptx2md.types import ParsedPresentation, SlideElement, ElementType, SlideType, ImageElement, FormulaElement # TextRun is used via get_formatted_runs
 from pptx2md.utils import rgb_to_hex
 
+# Marp specific single-character escapes (e.g. | for tables), plus vertical tab and form feed
+# which are replaced by spaces. Applied in one str.translate pass.
+_ESC_TABLE = str.maketrans({'|': '\\|', '*': '\\*', '`': '\\`', '\u000B': ' ', '\u000C': ' '})
+
+# Position hints for the left, center and right thirds of the slide
+_POSITION_HINTS = ("left", "center", "right")
+
+# Slide separator and the density class directives written in front of a slide
+_SLIDE_SEPARATOR = "\n---\n\n"
+_CLASS_COMMENTS = {slide_class: f"<!-- _class: {slide_class} -->\n\n" for slide_class in ("small", "smaller", "smallest")}
+
+# Element types whose content is run text formatted before being written
+_TEXT_ELEMENT_TYPES = frozenset((ElementType.Title, ElementType.Paragraph, ElementType.ListItem))
+
 class MarpFormatter(Formatter):
     # write outputs to marp markdown
-    def __init__(self, config):
-        super().__init__(config)
-        self.esc_re1 = re.compile(r'([\|\*`])') # Marp specific escapes (e.g. | for tables)
-        self.esc_re2 = re.compile(r'(<[^>]+>)')
+    esc_re2 = HTML_TAG_RE # Compiled once, shared by all instances
+    strong_delimiters = ('**', '**')
+    accent_delimiters = ('*', '*')
 
     def put_header(self):
         css_content = """
@@ -225,58 +235,71 @@ html: true
 
 ''')
 
+    def _put_title_element(self, element: SlideElement, text: str, last_element_type: Optional[ElementType]):
+        title_text = text.strip()
+        if not title_text:
+            return
+        is_similar_to_last = False
+        if self.last_title_info and self.last_title_info[1] == element.level and \
+           titles_are_similar(self.last_title_info[0], title_text):
+            is_similar_to_last = True
+
+        if is_similar_to_last:
+            if self.config.keep_similar_titles:
+                effective_title = f'{title_text}' # (cont.) removed for Marp simpler logic
+                self.put_title(effective_title, element.level)
+                self.last_title_info = (effective_title, element.level)
+        else:
+            self.put_title(title_text, element.level)
+            self.last_title_info = (title_text, element.level)
+
+    def _put_list_item_element(self, element: SlideElement, text: str, last_element_type: Optional[ElementType]):
+        if last_element_type is not ElementType.ListItem:
+            self.put_list_header()
+        self.put_list(text, element.level)
+
+    def _put_paragraph_element(self, element: SlideElement, text: str, last_element_type: Optional[ElementType]):
+        self.put_para(text)
+
+    def _put_image_element(self, element: SlideElement, text: str, last_element_type: Optional[ElementType]):
+        if isinstance(element, ImageElement):
+            self.put_image(element) # Marp put_image expects ImageElement
+
+    def _put_table_element(self, element: SlideElement, text: str, last_element_type: Optional[ElementType]):
+        if element.content:
+            # Cells are formatted lazily as put_table emits each row
+            format_cell = lambda cell: self.get_formatted_runs(cell) if isinstance(cell, list) else self.get_escaped(str(cell))
+            self.put_table((format_cell(cell) for cell in row) for row in element.content)
+
+    def _put_code_block_element(self, element: SlideElement, text: str, last_element_type: Optional[ElementType]):
+        code_content = getattr(element, 'content', '')
+        code_lang = getattr(element, 'language', None)
+        self.put_code_block(code_content, code_lang)
+
+    def _put_formula_element(self, element: SlideElement, text: str, last_element_type: Optional[ElementType]):
+        if isinstance(element, FormulaElement):
+            self.put_formula(element) # Base formula for $$...$$
+
     def _put_elements_on_slide(self, elements: List[SlideElement], is_continued_slide: bool = False):
+        element_writers = self._element_writers
         last_element_type: Optional[ElementType] = None
         for element_idx, element in enumerate(elements):
             current_content_str = ""
-            if element.type in [ElementType.Title, ElementType.Paragraph, ElementType.ListItem]:
+            if element.type in _TEXT_ELEMENT_TYPES:
                 if isinstance(element.content, list):
                     current_content_str = self.get_formatted_runs(element.content)
                 elif isinstance(element.content, str):
                     current_content_str = self.get_escaped(element.content) # Marp needs escaping for its syntax
 
-            match element.type:
-                case ElementType.Title:
-                    title_text = current_content_str.strip()
-                    if title_text:
-                        if not (is_continued_slide and element_idx == 0):
-                            is_similar_to_last = False
-                            if self.last_title_info and self.last_title_info[1] == element.level and \
-                               fuzz.ratio(self.last_title_info[0], title_text, score_cutoff=92):
-                                is_similar_to_last = True
-
-                            if is_similar_to_last:
-                                if self.config.keep_similar_titles:
-                                    effective_title = f'{title_text}' # (cont.) removed for Marp simpler logic
-                                    self.put_title(effective_title, element.level)
-                                    self.last_title_info = (effective_title, element.level)
-                            else:
-                                self.put_title(title_text, element.level)
-                                self.last_title_info = (title_text, element.level)
-                case ElementType.ListItem:
-                    if not (last_element_type == ElementType.ListItem):
-                        self.put_list_header()
-                    self.put_list(current_content_str, element.level)
-                case ElementType.Paragraph:
-                    self.put_para(current_content_str)
-                case ElementType.Image:
-                    if isinstance(element, ImageElement):
-                        self.put_image(element) # Marp put_image expects ImageElement
-                case ElementType.Table:
-                    if element.content:
-                        table_data = [[self.get_formatted_runs(cell) if isinstance(cell, list) else self.get_escaped(str(cell)) for cell in row] for row in element.content]
-                        self.put_table(table_data)
-                case ElementType.CodeBlock:
-                    code_content = getattr(element, 'content', '')
-                    code_lang = getattr(element, 'language', None)
-                    self.put_code_block(code_content, code_lang)
-                case ElementType.Formula:
-                    if isinstance(element, FormulaElement):
-                        self.put_formula(element) # Base formula for $$...$$
+            # The leading title of a continued slide repeats the previous one and is skipped
+            if not (element.type is ElementType.Title and is_continued_slide and element_idx == 0):
+                writer = element_writers.get(element.type)
+                if writer is not None:
+                    writer(element, current_content_str, last_element_type)
 
             last_element_type = element.type
 
-        if last_element_type == ElementType.ListItem:
+        if last_element_type is ElementType.ListItem:
             self.put_list_footer()
 
     def output(self, presentation_data: ParsedPresentation):
@@ -292,15 +315,15 @@ html: true
             marp_slide_counter += 1
 
             initial_elements_for_slide: List[SlideElement] = []
-            if slide.type == SlideType.General:
+            if slide.type is SlideType.General:
                 initial_elements_for_slide = slide.elements
-            elif slide.type == SlideType.MultiColumn:
+            elif slide.type is SlideType.MultiColumn:
                 # For Marp, flatten MultiColumn for now. Title/floats from preface, then other content.
-                initial_elements_for_slide = slide.preface + [el for col in slide.columns for el in col] 
+                initial_elements_for_slide = list(chain(slide.preface, *slide.columns))
 
             if not initial_elements_for_slide: 
                  if marp_slide_counter < num_total_slides : 
-                    self.write("\n---\n\n") # Writes directly to file
+                    self.write(_SLIDE_SEPARATOR) # Writes directly to file
                  continue
 
             # Separate title, floated images, and other content elements using base method
@@ -312,15 +335,17 @@ html: true
                 )
 
             # Calculate overall slide metrics based on all initial elements for density class
-            line_count, char_count, max_img_w, max_img_h, text_lines_for_avg, text_chars_for_avg = \
-                self._get_slide_content_metrics(initial_elements_for_slide) # Use all original elements for density
+            # The avg line length counts are only needed for column splitting, computed below if at all
+            line_count, char_count, max_img_w, max_img_h, _, _, _ = \
+                self._get_slide_content_metrics(initial_elements_for_slide, collect_avg=False) # Use all original elements for density
             current_slide_class = self._get_slide_density_class(line_count)
 
             # Determine if slide qualifies for column splitting based on 'other_content_elements'
             initial_split_qualification = False
+            contains_table_in_other_content = False
             if current_slide_class in ["smaller", "smallest"]:
                  # Calculate text metrics specifically for content that would go into columns
-                _, _, _, _, other_text_lines, other_text_chars = \
+                _, _, _, _, other_text_lines, other_text_chars, contains_table_in_other_content = \
                     self._get_slide_content_metrics(other_content_elements) # Metrics from non-title, non-floated
                 
                 if other_text_lines > 0: 
@@ -328,13 +353,6 @@ html: true
                     if avg_line_length < self.config.marp_columns_line_length_threshold: # Use a config threshold
                         initial_split_qualification = True
             
-            contains_table_in_other_content = False
-            if initial_split_qualification:
-                for element in other_content_elements:
-                    if element.type == ElementType.Table:
-                        contains_table_in_other_content = True
-                        break
-            
             actually_split_columns = initial_split_qualification and \
                                      len(other_content_elements) >= 2 and \
                                      not contains_table_in_other_content
@@ -345,7 +363,7 @@ html: true
                     effective_slide_class = "small" # Content is distributed
             
             if effective_slide_class:
-                self.write(f"<!-- _class: {effective_slide_class} -->\n\n")
+                self.write(_CLASS_COMMENTS[effective_slide_class])
 
             if main_title_element:
                 self._put_elements_on_slide([main_title_element], is_continued_slide=False)
@@ -376,7 +394,7 @@ html: true
             # Add slide separator if not the very last conceptual slide
             is_last_original_slide = (slide_idx == num_total_slides - 1)
             if not (is_last_original_slide) : # Add --- if not the true end
-                 self.write("\n---\n\n") # Writes directly
+                 self.write(_SLIDE_SEPARATOR) # Writes directly
 
         self.close()
 
@@ -391,120 +409,90 @@ html: true
 
     def put_image(self, element: Union[ImageElement, FormulaElement]):
         alt = element.alt_text if element.alt_text else ""
-        quoted_path = urllib.parse.quote(element.path)
-        
-        marp_alt_text_keywords = []
+        quoted_path = image_url(element.path)
         
         # Use configured slide dimensions, falling back to defaults, for scaling calculations.
         original_slide_width_px = self.config.slide_width_px or DEFAULT_SLIDE_WIDTH_PX
         original_slide_height_px = self.config.slide_height_px or DEFAULT_SLIDE_HEIGHT_PX
+        width_scale_factor = MARP_TARGET_WIDTH_PX / original_slide_width_px if original_slide_width_px > 0 else None
+        height_scale_factor = MARP_TARGET_HEIGHT_PX / original_slide_height_px if original_slide_height_px > 0 else None
 
-        # Get image's display dimensions from PowerPoint.
+        # Get image's display and intrinsic dimensions from PowerPoint.
         ppt_display_width = element.display_width_px
         ppt_display_height = element.display_height_px
+        original_width = element.original_width_px
+        original_height = element.original_height_px
+        # Height/width ratio of the image, when its intrinsic size is known.
+        image_aspect_ratio = original_height / original_width if original_width and original_height and original_width > 0 else None
 
         # If display width is not available from PPT, but a default image width is configured,
         # use it and calculate corresponding height maintaining aspect ratio (if available).
         if ppt_display_width is None and self.config.image_width is not None:
             ppt_display_width = self.config.image_width
-            if element.original_width_px and element.original_height_px and element.original_width_px > 0:
-                 aspect_ratio = element.original_height_px / element.original_width_px
-                 ppt_display_height = int(round(ppt_display_width * aspect_ratio))
+            if image_aspect_ratio is not None:
+                 ppt_display_height = int(round(ppt_display_width * image_aspect_ratio))
 
         scaled_marp_display_width = None
         scaled_marp_display_height = None
 
         # Scale image dimensions from original slide context to Marp target dimensions.
         # Prioritize scaling based on width, then height, maintaining aspect ratio if possible.
-        if ppt_display_width is not None and original_slide_width_px > 0:
-            width_scale_factor = MARP_TARGET_WIDTH_PX / original_slide_width_px
+        if ppt_display_width is not None and width_scale_factor is not None:
             scaled_marp_display_width = int(round(ppt_display_width * width_scale_factor))
 
-            if element.original_width_px and element.original_height_px and \
-               element.original_width_px > 0 and scaled_marp_display_width > 0:
-                image_aspect_ratio = element.original_height_px / element.original_width_px
+            if image_aspect_ratio is not None and scaled_marp_display_width > 0:
                 scaled_marp_display_height = int(round(scaled_marp_display_width * image_aspect_ratio))
             elif ppt_display_height is not None: # If aspect ratio unknown, scale height by same factor.
                 scaled_marp_display_height = int(round(ppt_display_height * width_scale_factor))
-        elif ppt_display_height is not None and original_slide_height_px > 0 and \
-             element.original_width_px and element.original_height_px and element.original_height_px > 0 :
+        elif ppt_display_height is not None and height_scale_factor is not None and \
+             original_width and original_height and original_height > 0 :
             # Fallback to scaling based on height if width-based scaling wasn't possible/applicable.
-            height_scale_factor = MARP_TARGET_HEIGHT_PX / original_slide_height_px
             scaled_marp_display_height = int(round(ppt_display_height * height_scale_factor))
-            if element.original_width_px > 0 and element.original_height_px > 0 : 
-                image_aspect_ratio_inv = element.original_width_px / element.original_height_px
-                scaled_marp_display_width = int(round(scaled_marp_display_height * image_aspect_ratio_inv))
+            if original_width > 0:
+                scaled_marp_display_width = int(round(scaled_marp_display_height * (original_width / original_height)))
 
         current_display_width = scaled_marp_display_width
         current_display_height = scaled_marp_display_height
         
-        # Add Marp sizing keywords (w:, h:) if dimensions are determined.
+        # Marp sizing keyword (w:) if dimensions are determined.
+        size_keyword = None
         if current_display_width is not None and current_display_width > 0:
-            marp_alt_text_keywords.append(f'w:{current_display_width}px') 
+            size_keyword = f'w:{current_display_width}px'
         # if current_display_height is not None and current_display_height > 0:
-        #     marp_alt_text_keywords.append(f'h:{current_display_height}px')
+        #     size_keyword += f' h:{current_display_height}px'
 
         # Determine position hint (left, center, right) based on scaled image position and size.
         slide_width_for_hinting = MARP_TARGET_WIDTH_PX
         position_hint = None
         
         scaled_left_px = None
-        if element.left_px is not None and original_slide_width_px > 0:
-            scaled_left_px = int(round(element.left_px * (MARP_TARGET_WIDTH_PX / original_slide_width_px)))
+        if element.left_px is not None and width_scale_factor is not None:
+            scaled_left_px = int(round(element.left_px * width_scale_factor))
 
         if scaled_left_px is not None and current_display_width is not None:
             image_center_x = scaled_left_px + (current_display_width / 2)
             # slide_center_x = slide_width_for_hinting / 2
             # center_threshold = slide_width_for_hinting * 0.10 # 10% threshold for centering
             
-            # Define boundaries for "left" and "right" thirds of the slide.
-            left_third_boundary = slide_width_for_hinting / 3
-            right_third_boundary = 2 * slide_width_for_hinting / 3
-
-            if left_third_boundary < image_center_x < right_third_boundary:
-                position_hint = "center" 
-            elif image_center_x < left_third_boundary: 
-                position_hint = "left"
-            elif image_center_x > right_third_boundary: 
-                position_hint = "right"
+            # Bucket the image center into the left, center or right third of the slide.
+            # Centers off the slide are clamped into the outer thirds.
+            third_index = int(image_center_x * 3 // slide_width_for_hinting)
+            position_hint = _POSITION_HINTS[min(2, max(0, third_index))]
 
         # Use the calculated position_hint, or fallback to a hint provided on the element itself.
         effective_position_hint = position_hint or getattr(element, 'position_hint', None)
         
-        if effective_position_hint:
-            if effective_position_hint == "center":
-                marp_alt_text_keywords.append("center") 
-            elif effective_position_hint == "left":
-                 marp_alt_text_keywords.append("left")
-            elif effective_position_hint == "right":
-                 marp_alt_text_keywords.append("right")
-
-        # Construct the final alt text string for Marp.
-        # Order is important: [bg/positioning] [original alt text] [w:/h: sizing keywords (if not bg)].
+        # Construct the final alt text string for Marp, in fixed slot order:
+        # [positioning] [original alt text] [w: sizing keyword].
+        # Background images ("bg" keywords) are disabled for now.
         ordered_alt_keywords = []
-        
-        # Add "bg" and its associated positioning keywords first.
-        if "bg" in marp_alt_text_keywords: ordered_alt_keywords.append("bg")
-        # Handle specific "bg left" and "bg right" by ensuring correct order.
-        if "bg left" in " ".join(marp_alt_text_keywords): ordered_alt_keywords = ["bg", "left"] 
-        elif "bg right" in " ".join(marp_alt_text_keywords): ordered_alt_keywords = ["bg", "right"]
-        
-        # Add non-background positioning keywords ("center", "left", "right").
-        has_bg_keyword = False # Disable background images for now
-        if not has_bg_keyword:
-            if "center" in marp_alt_text_keywords and "center" not in ordered_alt_keywords: ordered_alt_keywords.append("center")
-            if "left" in marp_alt_text_keywords and "left" not in ordered_alt_keywords: ordered_alt_keywords.append("left")
-            if "right" in marp_alt_text_keywords and "right" not in ordered_alt_keywords: ordered_alt_keywords.append("right")
-
+        if effective_position_hint in _POSITION_HINTS:
+            ordered_alt_keywords.append(effective_position_hint)
         if alt:
             ordered_alt_keywords.append(alt)
-            
-        # Add sizing keywords (w:, h:) last, unless it's a background image.
-        if not has_bg_keyword:
-            for kw in marp_alt_text_keywords:
-                if (kw.startswith("w:") or kw.startswith("h:")) and kw not in ordered_alt_keywords:
-                    ordered_alt_keywords.append(kw)
-        
+        if size_keyword and size_keyword != alt:
+            ordered_alt_keywords.append(size_keyword)
+
         final_marp_alt_string = " ".join(ordered_alt_keywords).strip()
 
         # Output the image using Marp's Markdown syntax.
@@ -521,12 +509,6 @@ html: true
         # Then, wrap the Marp-escaped text in single backticks for inline code.
         return f'`{escaped_text}`'
 
-    def get_accent(self, text):
-        return self._format_text_with_delimiters(text, '*', '*')
-
-    def get_strong(self, text):
-        return self._format_text_with_delimiters(text, '**', '**')
-
     def get_colored(self, text, rgb):
         # Standard HTML for color, Marp should support it
         return '<span style="color:%s">%s</span>' % (rgb_to_hex(rgb), text)
@@ -534,14 +516,11 @@ html: true
     def get_hyperlink(self, text, url):
         return '[' + text + '](' + url + ')'
 
-    def esc_repl(self, match):
-        return '\\' + match.group(0)
-
     def get_escaped(self, text):
-        if self.config.disable_escaping:
+        if self._disable_escaping:
             return text
-        # Replace problematic Unicode characters first
-        text = text.replace('\u000B', ' ').replace('\u000C', ' ')
-        text = re.sub(self.esc_re1, self.esc_repl, text)
-        text = re.sub(self.esc_re2, self.esc_repl, text)
-        return text
\ No newline at end of file
+        # Replace problematic Unicode characters and escape single characters in one pass,
+        # then escape HTML-like tags. The tag pass must run second so that characters inside
+        # tags are escaped as well.
+        text = text.translate(_ESC_TABLE)
+        return self.esc_re2.sub(r'\\\1', text)
\ No newline at end of file
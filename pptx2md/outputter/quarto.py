@@ -14,17 +14,17 @@
 # limitations under the License.
 
 import re
-import urllib.parse
+from itertools import islice
 from typing import List, Optional
 
-from rapidfuzz import fuzz
-
-from pptx2md.outputter.base import Formatter
+from pptx2md.outputter.base import Formatter, format_table_cell, image_url, titles_are_similar
 from pptx2md.types import ParsedPresentation, SlideElement, ElementType, SlideType, FormulaElement, ImageElement # ImageElement is used via put_image
 from pptx2md.utils import rgb_to_hex
 
 class QuartoFormatter(Formatter):
     # write outputs to quarto markdown - reveal js
+    strong_delimiters = ('**', '**') # Quarto uses **; accent keeps the Markdown '_'
+
     def __init__(self, config):
         super().__init__(config)
         self.esc_re1 = re.compile(r'([\\\*`!_\{\}\[\]\(\)\#\+-\.\|])') # Added | for tables
@@ -59,7 +59,7 @@ class QuartoFormatter(Formatter):
                         if title_text:
                             is_similar_to_last = False
                             if last_title_tracker['content'] and last_title_tracker['level'] == element.level and \
-                               fuzz.ratio(last_title_tracker['content'], title_text, score_cutoff=92):
+                               titles_are_similar(last_title_tracker['content'], title_text):
                                 is_similar_to_last = True
                             
                             if is_similar_to_last:
@@ -154,9 +154,7 @@ format:
         self.write(text + '\n\n')
 
     def put_image(self, element: ImageElement):
-        # Convert to forward slashes for URLs
-        path_with_forward_slashes = str(element.path).replace('\\', '/')
-        quoted_path = urllib.parse.quote(path_with_forward_slashes)
+        quoted_path = image_url(element.path)
         
         # Use alt_text if available, otherwise use a default
         alt_text = element.alt_text if element.alt_text else "Image"
@@ -171,13 +169,13 @@ format:
         # Quarto uses standard Pandoc Markdown tables, centered by default
         # Base Formatter.put_table provides left-aligned, let's make it centered for Quarto
         if not table or not table[0]: return
-        gen_table_row = lambda row: '| ' + ' | '.join([
-            c.replace('\n', '<br />') if '`' not in c else c.replace('\n', ' ') 
-            for c in row
-        ]) + ' |'
-        self.write(gen_table_row(table[0]) + '\n')
-        self.write(gen_table_row([':-:' for _ in table[0]]) + '\n') # Centered for Quarto
-        self.write('\n'.join([gen_table_row(row) for row in table[1:]]) + '\n\n')
+        gen_table_row = lambda row: '| ' + ' | '.join(map(format_table_cell, row)) + ' |'
+        separator_row = '| ' + ' | '.join([':-:'] * len(table[0])) + ' |' # Centered for Quarto
+
+        # Header, separator and body rows emitted in a single write; body rows are
+        # formatted as they are joined, without intermediate lists or a copy of the table
+        self.write(gen_table_row(table[0]) + '\n' + separator_row + '\n' +
+                   '\n'.join(map(gen_table_row, islice(table, 1, None))) + '\n\n')
 
     def put_code_block(self, code: str, language: Optional[str]):
         lang_tag = language if language else ""
@@ -186,9 +184,7 @@ format:
 
     # put_formula inherited from base Formatter for $$...$$
 
-    # get_accent, get_strong inherited (Markdown style)
-    def get_strong(self, text):
-        return self._format_text_with_delimiters(text, '**', '**') # Quarto uses **
+    # get_accent, get_strong inherited; strong uses the delimiters set above
 
     def get_colored(self, text, rgb):
         # Text is already escaped by _format_single_merged_run
@@ -200,7 +196,7 @@ format:
         return '\\' + match.group(0)
 
     def get_escaped(self, text):
-        if self.config.disable_escaping:
+        if self._disable_escaping:
             return text
         # Replace problematic Unicode characters first
         text = text.replace('\u000B', ' ').replace('\u000C', ' ')
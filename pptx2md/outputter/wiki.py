@@ -22,6 +22,10 @@ from pptx2md.types import ImageElement # Add this import
 
 class WikiFormatter(Formatter):
     # write outputs to wikitext
+    # Wiki typically uses ''' for bold and '' for italics
+    strong_delimiters = ("'''", "'''")
+    accent_delimiters = ("''", "''")
+
     def __init__(self, config):
         super().__init__(config)
         self.esc_re = re.compile(r'<([^>]+)>')
@@ -97,14 +101,6 @@ class WikiFormatter(Formatter):
             self.write('\n'.join(row_cells) + '\n') # One cell per line in this common format
         self.write('|}\n\n')
 
-    def get_accent(self, text):
-        # Wiki typically uses '' for italics
-        return self._format_text_with_delimiters(text, "''", "''")
-
-    def get_strong(self, text):
-        # Wiki typically uses ''' for bold
-        return self._format_text_with_delimiters(text, "'''", "'''")
-
     def get_colored(self, text, rgb):
         # Wiki might support <span style="color:..."> or specific templates
         # Using HTML version for broader compatibility if allowed by wiki
@@ -122,7 +118,7 @@ class WikiFormatter(Formatter):
         return self.wiki_esc_map.get(char, char)
 
     def get_escaped(self, text):
-        if self.config.disable_escaping:
+        if self._disable_escaping:
             return text
         # First, handle general XML/HTML-like escapes if any text might be HTML itself
         # text = text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;') # Basic HTML escape
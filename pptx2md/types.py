@@ -153,6 +153,12 @@ class TextStyle(BaseModel):
     is_code: bool = False
     is_math: bool = False
 
+    @property
+    def is_plain(self) -> bool:
+        """True if the run needs no markup beyond escaping."""
+        return not (self.is_code or self.is_math or self.is_strong or self.is_accent or
+                    self.color_rgb or self.hyperlink)
+
 
 class TextRun(BaseModel):
     text: str
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import functools
 import logging
 import os
 import re
@@ -104,6 +105,8 @@ def prepare_titles(title_path: Path) -> dict[str, int]:
     return titles
 
 
+# A deck uses few distinct colors, and every colored run converts one
+@functools.lru_cache(maxsize=256)
 def rgb_to_hex(rgb):
     r, g, b = rgb
     return f'#{r:02x}{g:02x}{b:02x}'